@@ -12,13 +12,16 @@ What it does
 - Renders answer sheets with ReportLab.
 - Optionally renders cover sheets by compiling a LaTeX wrapper that \\input{}'s a
   user-maintained .tex content file.
-- Merges the per-student PDFs into combined PDFs.
+- Renders all answer sheets into one combined PDF (or, with --per-student,
+  merges the per-student PDFs); the cover sheet is compiled once, directly into
+  the combined cover PDF.
 - Supports student names via --student-names-csv (alternative to --student-id-start + --student-id-count).
 
 Requirements (for cover sheets)
 - A working LaTeX installation that provides 'pdflatex' (e.g., MacTeX).
-- Python package 'pypdf' (preferred) or 'PyPDF2' for merging (optional).
+- Python package 'pikepdf' (fastest), 'pypdf' or 'PyPDF2' for merging (optional).
   If not installed, you can still generate separate PDFs.
+- Python package 'orjson' (optional) for faster layout.json output.
 
 For usage check --help
 
@@ -26,12 +29,15 @@ For usage check --help
 """
 from __future__ import annotations
 
-import argparse, csv, json, os, string, math, shutil, tempfile, subprocess
-from dataclasses import dataclass
+import argparse, csv, json, os, re, string, math, shutil, tempfile, subprocess
+import functools, hashlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
 from typing import List, Dict, Any, Optional
 from datetime import date
 from pathlib import Path
 
+import numpy as np
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4, letter
 from reportlab.lib.units import mm
@@ -86,16 +92,17 @@ _UNICODE_FONT = _get_umlaut_font()
 def parse_csv(s: str):
     return [x.strip() for x in s.split(",") if x.strip()]
 
+@functools.lru_cache(maxsize=None)
 def option_labels(n: int):
     letters = list(string.ascii_uppercase)
     if n <= 26:
-        return letters[:n]
+        return tuple(letters[:n])
     out = letters[:]
     i = 0
     while len(out) < n:
         out.append(letters[i // 26] + letters[i % 26])
         i += 1
-    return out[:n]
+    return tuple(out[:n])
 
 def parse_per_question_counts(spec: str, num_questions: int):
     raw = parse_csv(spec)
@@ -125,6 +132,9 @@ class Box:
     w_pt: float
     h_pt: float
 
+# Layout entries that are only used while rendering and not written to layout.json.
+_RUNTIME_LAYOUT_KEYS = ("boxes_soa", "q_slices")
+
 def compute_layout(paper, title, num_questions, per_q_counts,
                    columns, force_columns,
                    row_gap_mm, col_gap_mm, box_size_mm):
@@ -173,7 +183,10 @@ def compute_layout(paper, title, num_questions, per_q_counts,
 
     col_width = (usable_right - usable_left - (cols_used - 1) * col_gap_x) / cols_used
 
-    boxes = []
+    qs: List[int] = []
+    opts: List[int] = []
+    xs: List[float] = []
+    ys: List[float] = []
     for r in range(rows):
         y_row_top = content_top - r * q_block_h
         for cidx in range(cols_used):
@@ -182,10 +195,31 @@ def compute_layout(paper, title, num_questions, per_q_counts,
                 break
             k = per_q_counts[q - 1]
             box_y_top = y_row_top - 8 * mm
-            col_x = usable_left + cidx * (col_width + col_gap_x)
+            col_x = float(usable_left + cidx * (col_width + col_gap_x))
             for oi in range(k):
-                yy = box_y_top - oi * (box_size + box_gap_y)
-                boxes.append(Box(q, oi, float(col_x), float(yy), float(box_size), float(box_size)))
+                qs.append(q)
+                opts.append(oi)
+                xs.append(col_x)
+                ys.append(float(box_y_top - oi * (box_size + box_gap_y)))
+    ws = [float(box_size)] * len(qs)
+
+    # layout.json records: one dict per box with the Box field names
+    box_keys = [f.name for f in fields(Box)]
+    boxes = [dict(zip(box_keys, values)) for values in zip(qs, opts, xs, ys, ws, ws)]
+
+    # Struct-of-arrays copy of the boxes (already ordered by question and
+    # option) plus the [start, end) range of each question, for rendering.
+    boxes_soa = {
+        "q": np.array(qs, dtype=np.int16),
+        "opt": np.array(opts, dtype=np.int16),
+        "x": np.array(xs, dtype=np.float64),
+        "y": np.array(ys, dtype=np.float64),
+        "w": np.array(ws, dtype=np.float64),
+        "h": np.array(ws, dtype=np.float64),
+    }
+    counts = np.asarray(per_q_counts, dtype=np.int64)
+    q_ends = np.cumsum(counts)
+    q_starts = q_ends - counts
 
     return {
         "paper": paper,
@@ -197,27 +231,45 @@ def compute_layout(paper, title, num_questions, per_q_counts,
         "num_questions": num_questions,
         "per_question_option_counts": per_q_counts,
         "options_list": per_q_counts,
+        "option_labels_per_q": [option_labels(k) for k in per_q_counts],
         "marker": {"margin_pt": float(margin), "size_pt": float(marker_size)},
         "geometry": {
             "box_size_pt": float(box_size),
             "box_gap_y_pt": float(box_gap_y),
             "opt_label_gap_pt": float(opt_label_gap),
         },
-        "boxes": [b.__dict__ for b in boxes],
+        "boxes": boxes,
+        "boxes_soa": boxes_soa,
+        "q_slices": list(zip(q_starts.tolist(), q_ends.tolist())),
         "student_id_print": {"x_pt": float(usable_left), "y_pt": float(usable_top - top_title_gap - 2 * mm)},
         "answer_key": [],
     }
 
-def render_sheet(path, layout, student_id=None, student_name=None, fill_solution=False,
-                 course_name="", professor="", exam_date="", prefix_header_only=False,
-                 question_label="Frage"):
+def dump_layout(path, layout) -> None:
+    """
+    Write `layout` (without runtime-only entries) as indented JSON. Uses
+    orjson if available, otherwise the standard library json module.
+    """
+    data = {k: v for k, v in layout.items() if k not in _RUNTIME_LAYOUT_KEYS}
+    try:
+        import orjson  # type: ignore
+    except Exception:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        return
+    Path(path).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
+def _title_y(layout):
+    """Baseline of the title band; the Student ID line sits 18pt below it."""
     W, H = PAPERS[layout["paper"]]
-    c = canvas.Canvas(path, pagesize=(W, H))
+    header_y = (H - layout["marker"]["margin_pt"]) - layout["marker"]["size_pt"] - 6*mm
+    rule_y = header_y - 18
+    return rule_y - 28
 
-    # Auto date if not provided
-    if not exam_date:
-        exam_date = date.today().strftime("%d. %B %Y")
+def _draw_static_content(c, layout, course_name="", professor="", exam_date="",
+                         prefix_header_only=False, question_label="Frage"):
+    """Draw everything that is identical on every sheet (no Student ID / name)."""
+    W, H = PAPERS[layout["paper"]]
 
     margin = layout["marker"]["margin_pt"]
     marker_size = layout["marker"]["size_pt"]
@@ -242,7 +294,7 @@ def render_sheet(path, layout, student_id=None, student_name=None, fill_solution
     c.line(margin, rule_y, W - margin, rule_y)
 
     # ---- TITLE BAND ----
-    title_y = rule_y - 28
+    title_y = _title_y(layout)
     header_prefix = layout.get("question_prefix", "") if prefix_header_only else ""
     title_text = layout["title"]
     if header_prefix:
@@ -250,6 +302,84 @@ def render_sheet(path, layout, student_id=None, student_name=None, fill_solution
     c.setFont("Times-Bold", 26)
     c.drawCentredString(W / 2, title_y, title_text)
 
+    # ---- QUESTIONS / BOXES ----
+    # Question labels first, then all boxes and option labels, so each font
+    # is selected once per sheet instead of twice per question.
+    prefix = layout.get("question_prefix", "")
+    if prefix and not prefix_header_only:
+        prefix_str = str(prefix).rstrip(".") + "."
+    else:
+        prefix_str = ""
+    question_texts = [f"{question_label} {prefix_str}{q}" for q in range(1, len(layout["q_slices"]) + 1)]
+
+    soa = layout["boxes_soa"]
+    xs, ys, ws, hs = (soa[k].tolist() for k in ("x", "y", "w", "h"))
+    opts = soa["opt"].tolist()
+
+    c.setFont("Times-Bold", 14)
+    for text, (start, end) in zip(question_texts, layout["q_slices"]):
+        if start == end:
+            continue
+        c.drawString(xs[start], ys[start] + hs[start] + 2.5 * mm, text)
+
+    c.setFont("Times-Roman", 12)
+    label_gap = layout["geometry"]["opt_label_gap_pt"]
+    for labels, (start, end) in zip(layout["option_labels_per_q"], layout["q_slices"]):
+        for i in range(start, end):
+            c.rect(xs[i], ys[i], ws[i], hs[i])
+
+            c.drawString(
+                xs[i] + ws[i] + label_gap,
+                ys[i] + 0.5 * mm,
+                f"({labels[opts[i]]})"
+            )
+
+def _draw_solution_fill(c, layout):
+    """Fill the answer-key box of every question."""
+    soa = layout["boxes_soa"]
+    xs, ys, ws, hs = (soa[k].tolist() for k in ("x", "y", "w", "h"))
+    opts = soa["opt"].tolist()
+
+    c.setFillColor(colors.black)
+    for ans, (start, end) in zip(layout["answer_key"], layout["q_slices"]):
+        for i in range(start, end):
+            if opts[i] == ans:
+                c.rect(xs[i], ys[i], ws[i], hs[i], fill=1, stroke=0)
+
+def build_static_template(c, layout, fill_solution=False, course_name="", professor="",
+                          exam_date="", prefix_header_only=False, question_label="Frage"):
+    """
+    Register the student-independent part of the sheet on canvas `c` as the
+    form XObject "sheet" (plus "solution" with the filled answer boxes), so
+    every page of that canvas can stamp it with c.doForm() instead of
+    re-emitting all markers, boxes and labels.
+    """
+    # Auto date if not provided
+    if not exam_date:
+        exam_date = date.today().strftime("%d. %B %Y")
+
+    c.beginForm("sheet")
+    _draw_static_content(
+        c, layout,
+        course_name=course_name,
+        professor=professor,
+        exam_date=exam_date,
+        prefix_header_only=prefix_header_only,
+        question_label=question_label,
+    )
+    c.endForm()
+
+    if fill_solution:
+        c.beginForm("solution")
+        _draw_solution_fill(c, layout)
+        c.endForm()
+
+def _draw_student_fields(c, layout, student_id=None, student_name=None):
+    """Draw the per-student Student ID (left) and name (right) under the title."""
+    W, _ = PAPERS[layout["paper"]]
+    margin = layout["marker"]["margin_pt"]
+    title_y = _title_y(layout)
+
     # Student ID under title (left) / Student name under title (right)
     c.setFont("Times-Bold", 14)
     if student_id:
@@ -263,49 +393,58 @@ def render_sheet(path, layout, student_id=None, student_name=None, fill_solution
             c.setFont("Times-Bold", 14)
         c.drawRightString(W - margin, title_y - 18, f"{student_name}")
 
-    # ---- QUESTIONS / BOXES ----
-    boxes_by_q: Dict[int, List[Dict[str, Any]]] = {}
-    for b in layout["boxes"]:
-        boxes_by_q.setdefault(int(b["q"]), []).append(b)
-    for q in boxes_by_q:
-        boxes_by_q[q].sort(key=lambda x: x["opt"])
+def _draw_one_page(c, layout, student_id=None, student_name=None, fill_solution=False):
+    """Draw one sheet on `c` from the forms registered by build_static_template()."""
+    c.doForm("sheet")
+    if fill_solution:
+        c.doForm("solution")
+    _draw_student_fields(c, layout, student_id=student_id, student_name=student_name)
 
-    for q in sorted(boxes_by_q.keys()):
-        bxs = boxes_by_q[q]
-        first = bxs[0]
+def render_sheet(path, layout, student_id=None, student_name=None, fill_solution=False,
+                 course_name="", professor="", exam_date="", prefix_header_only=False,
+                 question_label="Frage"):
 
-        c.setFont("Times-Bold", 14)
-        prefix = layout.get("question_prefix", "")
-        if prefix and not prefix_header_only:
-            prefix_str = str(prefix).rstrip(".")
-            qlabel = f"{prefix_str}.{q}"
-        else:
-            qlabel = str(q)
-        c.drawString(first["x_pt"], first["y_pt"] + first["h_pt"] + 2.5 * mm, f"{question_label} {qlabel}")
+    W, H = PAPERS[layout["paper"]]
+    c = canvas.Canvas(path, pagesize=(W, H), pageCompression=1)
+
+    build_static_template(
+        c, layout,
+        fill_solution=fill_solution,
+        course_name=course_name,
+        professor=professor,
+        exam_date=exam_date,
+        prefix_header_only=prefix_header_only,
+        question_label=question_label,
+    )
 
-        c.setFont("Times-Roman", 12)
-        labels = option_labels(layout["per_question_option_counts"][q - 1])
+    _draw_one_page(c, layout, student_id=student_id, student_name=student_name,
+                   fill_solution=fill_solution)
 
-        for b in bxs:
-            c.rect(b["x_pt"], b["y_pt"], b["w_pt"], b["h_pt"])
+    c.showPage()
+    c.save()
 
-            if fill_solution and layout["answer_key"][q - 1] == b["opt"]:
-                c.rect(
-                    b["x_pt"],
-                    b["y_pt"],
-                    b["w_pt"],
-                    b["h_pt"],
-                    fill=1,
-                    stroke=0
-                )
+def render_all_sheets(path, layout, students, course_name="", professor="", exam_date="",
+                      prefix_header_only=False, question_label="Frage"):
+    """
+    Render one answer sheet per (student_id, student_name) in `students` as
+    consecutive pages of a single PDF. All pages share one static form.
+    """
+    W, H = PAPERS[layout["paper"]]
+    c = canvas.Canvas(path, pagesize=(W, H), pageCompression=1)
+
+    build_static_template(
+        c, layout,
+        course_name=course_name,
+        professor=professor,
+        exam_date=exam_date,
+        prefix_header_only=prefix_header_only,
+        question_label=question_label,
+    )
 
-            c.drawString(
-                b["x_pt"] + b["w_pt"] + layout["geometry"]["opt_label_gap_pt"],
-                b["y_pt"] + 0.5 * mm,
-                f"({labels[b['opt']]})"
-            )
+    for student_id, student_name in students:
+        _draw_one_page(c, layout, student_id=student_id, student_name=student_name)
+        c.showPage()
 
-    c.showPage()
     c.save()
 
 # ----------------------------
@@ -325,13 +464,15 @@ _LATEX_WRAPPER = r"""
 
 \pagestyle{empty}
 
+\begin{document}
+
+%% Per-exam macros are defined after \begin{document}, so the preamble (and
+%% its precompiled format) stays the same across courses and dates.
 \newcommand{\CourseName}{%(course)s}
 \newcommand{\Professor}{%(prof)s}
 \newcommand{\ExamDate}{%(date)s}
 \newcommand{\CoverTitle}{%(cover_title)s}
 
-\begin{document}
-
 \begin{center}
 {\Large \textbf{\CourseName}}\\
 \vspace{0.2cm}
@@ -352,27 +493,25 @@ _LATEX_WRAPPER = r"""
 \end{document}
 """
 
+# Minimal escaping for common special chars.
+_LATEX_TRANS = str.maketrans({
+    "\\": r"\textbackslash{}",
+    "&": r"\&",
+    "%": r"\%",
+    "$": r"\$",
+    "#": r"\#",
+    "_": r"\_",
+    "{": r"\{",
+    "}": r"\}",
+    "~": r"\textasciitilde{}",
+    "^": r"\textasciicircum{}",
+})
+
 def _latex_escape(s: str) -> str:
     """Escape strings for safe insertion into LaTeX macro definitions."""
     if s is None:
         return ""
-    # Minimal escaping for common special chars.
-    repl = {
-        "\\": r"\textbackslash{}",
-        "&": r"\&",
-        "%": r"\%",
-        "$": r"\$",
-        "#": r"\#",
-        "_": r"\_",
-        "{": r"\{",
-        "}": r"\}",
-        "~": r"\textasciitilde{}",
-        "^": r"\textasciicircum{}",
-    }
-    out = []
-    for ch in str(s):
-        out.append(repl.get(ch, ch))
-    return "".join(out)
+    return str(s).translate(_LATEX_TRANS)
 
 def _strip_cover_fields(tex_content: str) -> str:
     """Remove Name/Vorname, Klasse, and Unterschrift field lines from LaTeX content.
@@ -380,7 +519,6 @@ def _strip_cover_fields(tex_content: str) -> str:
     Strips \\textbf{Name, Vorname:}, \\textbf{Klasse:}, \\textbf{Unterschrift:}
     blocks including surrounding \\noindent, \\vspace, and \\rule lines.
     """
-    import re
     # Remove blocks like:
     #   \vspace{...}
     #   \noindent
@@ -396,6 +534,97 @@ def _strip_cover_fields(tex_content: str) -> str:
     return re.sub(pattern, '', tex_content)
 
 
+_SHM_DIR = "/dev/shm"
+
+def _fast_tmp_dir() -> Optional[str]:
+    """RAM-backed tmpfs directory for transient files, or None if unavailable."""
+    return _SHM_DIR if os.path.isdir(_SHM_DIR) and os.access(_SHM_DIR, os.W_OK) else None
+
+# Commands that need a second pdflatex pass to resolve.
+_CROSSREF_RE = re.compile(r"\\(label|ref|pageref|cite|tableofcontents|bibliography)\b")
+
+def _cache_dir() -> Path:
+    """Persistent per-user cache directory (e.g. ~/.cache/AGEx)."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "AGEx"
+
+def _store_in_cache(src: Path, cached: Path) -> None:
+    """Atomically copy `src` to `cached`. Best effort: a read-only home
+    directory only costs the cross-run reuse."""
+    try:
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        partial = cached.with_name(f"{cached.name}.{os.getpid()}.tmp")
+        shutil.copyfile(src, partial)
+        os.replace(partial, cached)
+    except OSError:
+        pass
+
+@functools.lru_cache(maxsize=None)
+def _pdflatex_version() -> str:
+    """Full `pdflatex --version` output, identifying the TeX build."""
+    p = subprocess.run(["pdflatex", "--version"], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    return p.stdout
+
+@functools.lru_cache(maxsize=None)
+def _has_mylatexformat() -> bool:
+    """Whether the TeX installation provides mylatexformat.ltx (probed once)."""
+    if shutil.which("kpsewhich") is None:
+        return False
+    p = subprocess.run(["kpsewhich", "mylatexformat.ltx"],
+                       stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    return p.returncode == 0 and bool(p.stdout.strip())
+
+def _cover_format(td_path: Path, tex: str) -> Optional[str]:
+    """
+    Provide a precompiled pdflatex format for the preamble of `tex` in `td_path`
+    and return its name, or None if it cannot be built (e.g. mylatexformat is
+    not installed).
+
+    The format is dumped once with mylatexformat and cached in _cache_dir(),
+    keyed by a hash of the pdflatex build and the preamble, so later runs skip
+    loading the packages. A failed dump is recorded under the same key and
+    not retried.
+    """
+    preamble = tex.split(r"\begin{document}", 1)[0]
+    key = hashlib.sha256(
+        f"{shutil.which('pdflatex')}\0{_pdflatex_version()}\0{preamble}".encode("utf-8")).hexdigest()[:16]
+    name = f"covercache_{key}"
+    cached = _cache_dir() / f"{name}.fmt"
+    failed = _cache_dir() / f"{name}.failed"
+
+    if cached.exists():
+        shutil.copyfile(cached, td_path / f"{name}.fmt")
+        return name
+
+    if failed.exists() or not _has_mylatexformat():
+        return None
+
+    cmd = ["pdflatex", "-ini", "-interaction=nonstopmode", "-halt-on-error", f"-jobname={name}",
+           "&pdflatex", "mylatexformat.ltx", "cover_wrapper.tex"]
+    p = subprocess.run(cmd, cwd=str(td_path), stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    fmt_path = td_path / f"{name}.fmt"
+    if p.returncode != 0 or not fmt_path.exists():
+        try:
+            failed.parent.mkdir(parents=True, exist_ok=True)
+            failed.touch()
+        except OSError:
+            pass
+        return None
+
+    _store_in_cache(fmt_path, cached)
+    return name
+
+def _run_pdflatex(td_path: Path, passes: int, fmt: Optional[str] = None):
+    """Run pdflatex `passes` times on cover_wrapper.tex; returns the last CompletedProcess."""
+    cmd = ["pdflatex"] + ([f"-fmt={fmt}"] if fmt else []) + [
+        "-interaction=nonstopmode", "-halt-on-error", "cover_wrapper.tex"]
+    draft_cmd = cmd[:1] + ["-draftmode"] + cmd[1:]
+    for pass_cmd in [draft_cmd] * (passes - 1) + [cmd]:
+        p = subprocess.run(pass_cmd, cwd=str(td_path), stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        if p.returncode != 0:
+            break
+    return p
+
 def compile_cover_pdf(
     out_pdf: str,
     cover_content_path: str,
@@ -404,9 +633,20 @@ def compile_cover_pdf(
     exam_date: str,
     cover_title: str = "Exam paper",
     no_cover_fields: bool = False,
+    single_pass: bool = False,
+    fast_tmp: bool = False,
+    use_cache: bool = False,
 ) -> None:
     """
     Compile a LaTeX cover PDF that inputs `cover_content_path` as cover_content.tex.
+
+    pdflatex runs twice only if the content uses cross-references (\\label,
+    \\ref, \\cite, ...); `single_pass` forces a single run regardless.
+    With `fast_tmp`, pdflatex works in a tmpfs directory (/dev/shm) if available.
+    With `use_cache`, the preamble is loaded from a cached precompiled format
+    when possible (see _cover_format), and the finished PDF is also cached,
+    keyed by a hash of all inputs and the pdflatex build, and reused without
+    running pdflatex. Without it nothing is written outside the build dir.
     """
     out_pdf = str(out_pdf)
     cover_content_path = str(cover_content_path)
@@ -418,7 +658,8 @@ def compile_cover_pdf(
             "and ensure 'pdflatex' is on your PATH."
         )
 
-    with tempfile.TemporaryDirectory(prefix="covertex_") as td:
+    tmp_parent = _fast_tmp_dir() if fast_tmp else None
+    with tempfile.TemporaryDirectory(prefix="covertex_", dir=tmp_parent) as td:
         td_path = Path(td)
 
         # Copy user content into temp dir, optionally stripping field lines
@@ -428,6 +669,8 @@ def compile_cover_pdf(
             (td_path / "cover_content.tex").write_text(content, encoding="utf-8")
         else:
             shutil.copyfile(cover_content_path, td_path / "cover_content.tex")
+            # Only scanned for cross-references below, so decode leniently.
+            content = Path(cover_content_path).read_text(encoding="utf-8", errors="replace")
 
         # Copy guidelines PDF asset if present next to the cover content
         guidelines_name = "single_choice_selection_guidelines.pdf"
@@ -444,24 +687,158 @@ def compile_cover_pdf(
         }
         (td_path / "cover_wrapper.tex").write_text(tex, encoding="utf-8")
 
-        # Run pdflatex twice for stability (TOC etc not used, but harmless)
-        cmd = ["pdflatex", "-interaction=nonstopmode", "-halt-on-error", "cover_wrapper.tex"]
-        for _ in range(2):
-            p = subprocess.run(cmd, cwd=str(td_path), stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-            if p.returncode != 0:
-                raise RuntimeError(f"LaTeX compilation failed:\n{p.stdout}")
+        # The wrapper itself has no cross-references, so a second pdflatex run
+        # is only needed when the user content does. Earlier passes only have
+        # to write the .aux file, so -draftmode skips PDF output there.
+        passes = 2 if _CROSSREF_RE.search(content) and not single_pass else 1
+
+        # The cover is fully determined by the build directory contents and
+        # the TeX installation, so a PDF compiled earlier from the same inputs
+        # can be reused as is.
+        if use_cache:
+            digest = hashlib.sha256(
+                f"{shutil.which('pdflatex')}\0{_pdflatex_version()}\0{passes}\0{tex}".encode("utf-8"))
+            for name in ("cover_content.tex", guidelines_name):
+                if (td_path / name).exists():
+                    digest.update(b"\0" + name.encode("utf-8") + b"\0" + (td_path / name).read_bytes())
+            cached_pdf = _cache_dir() / f"cover_{digest.hexdigest()[:32]}.pdf"
+            if cached_pdf.exists():
+                os.makedirs(os.path.dirname(out_pdf), exist_ok=True)
+                shutil.copyfile(cached_pdf, out_pdf)
+                return
+
+        fmt = _cover_format(td_path, tex) if use_cache else None
+        p = _run_pdflatex(td_path, passes, fmt)
+        if p.returncode != 0 and fmt is not None:
+            # Retry with the standard format. Only if that succeeds was the
+            # cached format at fault (e.g. stale after a TeX update), so only
+            # then is it dropped; errors in the user content keep it.
+            p = _run_pdflatex(td_path, passes)
+            if p.returncode == 0:
+                (_cache_dir() / f"{fmt}.fmt").unlink(missing_ok=True)
+        if p.returncode != 0:
+            raise RuntimeError(f"LaTeX compilation failed:\n{p.stdout}")
 
         pdf_path = td_path / "cover_wrapper.pdf"
         if not pdf_path.exists():
             raise RuntimeError("LaTeX compilation did not produce a PDF (cover_wrapper.pdf missing).")
 
+        if use_cache:
+            _store_in_cache(pdf_path, cached_pdf)
+
         os.makedirs(os.path.dirname(out_pdf), exist_ok=True)
         shutil.copyfile(pdf_path, out_pdf)
 
+# Number of input PDFs appended before the partial merge is flushed to disk.
+_MERGE_FLUSH_EVERY = 64
+
+def _share_identical_resources(pdf) -> None:
+    """
+    Make all pages of the pikepdf `pdf` reference one copy of each XObject
+    (e.g. the static "sheet" form) and font whose decoded content is
+    identical across pages. Duplicates become unreferenced and are dropped
+    on save.
+    """
+    import pikepdf  # type: ignore
+
+    memo: Dict[Any, Any] = {}
+
+    def fingerprint(obj):
+        if isinstance(obj, pikepdf.Object) and obj.is_indirect:
+            og = obj.objgen
+            if og in memo:
+                # None marks an object that is still being fingerprinted (cycle).
+                return memo[og] if memo[og] is not None else ("ref", og)
+            memo[og] = None
+        if isinstance(obj, pikepdf.Stream):
+            # Compare decoded data: saving a partial merge recompresses the
+            # streams written so far, so equal content can differ in its raw
+            # bytes and encoding parameters.
+            try:
+                data = obj.read_bytes()
+                skip = ("/Length", "/Filter", "/DecodeParms")
+            except pikepdf.PdfError:
+                data = obj.read_raw_bytes()
+                skip = ("/Length",)
+            items = [(k, v) for k, v in obj.stream_dict.items() if k not in skip]
+            fp = ("stream", hashlib.sha256(data).hexdigest(),
+                  tuple((k, fingerprint(v)) for k, v in sorted(items, key=lambda kv: kv[0])))
+        elif isinstance(obj, pikepdf.Dictionary):
+            fp = ("dict", tuple((k, fingerprint(v)) for k, v in sorted(obj.items(), key=lambda kv: kv[0])))
+        elif isinstance(obj, pikepdf.Array):
+            fp = ("array", tuple(fingerprint(v) for v in obj))
+        else:
+            fp = ("scalar", repr(obj))
+        if isinstance(obj, pikepdf.Object) and obj.is_indirect:
+            memo[obj.objgen] = fp
+        return fp
+
+    canonical: Dict[Any, Any] = {}
+    for page in pdf.pages:
+        resources = page.obj.get("/Resources")
+        if resources is None:
+            continue
+        for category in ("/XObject", "/Font"):
+            entries = resources.get(category)
+            if entries is None:
+                continue
+            for name in list(entries.keys()):
+                obj = entries[name]
+                if not obj.is_indirect:
+                    continue
+                entries[name] = canonical.setdefault(fingerprint(obj), obj)
+
+def _merge_pdfs_pikepdf(out_pdf: str, pdf_paths: List[str]) -> bool:
+    """
+    Merge PDFs with pikepdf (qpdf). Pages are appended at the object level, so
+    content streams are not re-parsed. Returns False if pikepdf is unavailable.
+
+    Every _MERGE_FLUSH_EVERY inputs the partial result is saved and reopened,
+    so only that many source PDFs are held open at any time. Resources that
+    are identical across pages are stored only once in the output.
+    """
+    try:
+        import pikepdf  # type: ignore
+    except Exception:
+        return False
+
+    os.makedirs(os.path.dirname(out_pdf), exist_ok=True)
+    partial = out_pdf + ".partial"
+
+    # Source PDFs must stay open until the merged file is saved, because
+    # qpdf copies foreign stream data lazily.
+    out = pikepdf.Pdf.new()
+    sources = []
+    try:
+        for pth in pdf_paths:
+            src = pikepdf.Pdf.open(pth)
+            sources.append(src)
+            out.pages.extend(src.pages)
+            if len(sources) >= _MERGE_FLUSH_EVERY:
+                _share_identical_resources(out)
+                out.save(partial)
+                out.close()
+                for opened in sources:
+                    opened.close()
+                sources.clear()
+                out = pikepdf.Pdf.open(partial, allow_overwriting_input=True)
+        _share_identical_resources(out)
+        out.save(out_pdf)
+    finally:
+        out.close()
+        for opened in sources:
+            opened.close()
+        if os.path.exists(partial):
+            os.remove(partial)
+    return True
+
 def merge_pdfs(out_pdf: str, pdf_paths: List[str]) -> None:
     """
-    Merge PDFs in order. Uses pypdf if available, otherwise PyPDF2.
+    Merge PDFs in order. Uses pikepdf if available, otherwise pypdf or PyPDF2.
     """
+    if _merge_pdfs_pikepdf(out_pdf, pdf_paths):
+        return
+
     try:
         from pypdf import PdfReader, PdfWriter  # type: ignore
     except Exception:
@@ -469,8 +846,8 @@ def merge_pdfs(out_pdf: str, pdf_paths: List[str]) -> None:
             from PyPDF2 import PdfReader, PdfWriter  # type: ignore
         except Exception as e:
             raise RuntimeError(
-                "PDF merge requested but neither 'pypdf' nor 'PyPDF2' is installed. "
-                "Install with: pip install pypdf"
+                "PDF merge requested but none of 'pikepdf', 'pypdf' or 'PyPDF2' is installed. "
+                "Install with: pip install pikepdf"
             ) from e
 
     writer = PdfWriter()
@@ -483,6 +860,52 @@ def merge_pdfs(out_pdf: str, pdf_paths: List[str]) -> None:
     with open(out_pdf, "wb") as f:
         writer.write(f)
 
+def _publish(src, dst) -> None:
+    """
+    Place `src` at `dst` as a hardlink (no data copy); falls back to copying
+    if linking is not possible, e.g. across filesystems.
+    """
+    if os.path.lexists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+# Inputs shared by all _render_one calls in a process, set once per worker
+# by _init_render_worker instead of being pickled with every task.
+_WORKER_STATE: Dict[str, Any] = {}
+
+def _init_render_worker(layout, render_kwargs, tmp_dir, publish_dir=None) -> None:
+    """Process-pool initializer: store the shared inputs for _render_one."""
+    _WORKER_STATE.update(
+        layout=layout,
+        render_kwargs=render_kwargs,
+        tmp_dir=tmp_dir,
+        publish_dir=publish_dir,
+    )
+
+def _render_one(student) -> str:
+    """
+    Render one student's answer sheet into the worker's `tmp_dir`.
+    If a `publish_dir` was given, the sheet is also published there, so this
+    runs in the workers alongside rendering instead of serially afterwards.
+    """
+    student_id, student_name, student_key = student
+    ans_pdf_tmp = Path(_WORKER_STATE["tmp_dir"]) / f"answer_sheet_{student_key}.pdf"
+    render_sheet(
+        str(ans_pdf_tmp),
+        _WORKER_STATE["layout"],
+        student_id=student_id,
+        student_name=student_name,
+        fill_solution=False,
+        **_WORKER_STATE["render_kwargs"],
+    )
+    publish_dir = _WORKER_STATE["publish_dir"]
+    if publish_dir is not None:
+        _publish(ans_pdf_tmp, os.path.join(publish_dir, f"answer_sheet_{student_key}.pdf"))
+    return str(ans_pdf_tmp)
+
 # ----------------------------
 # CLI
 # ----------------------------
@@ -538,6 +961,13 @@ def main():
                     help="Disable cover sheet generation even if --cover-tex is provided.")
     ap.add_argument("--no-cover-fields", action="store_true",
                     help="Remove the Last Name/First Name, Class, and Signature lines from the cover sheet.")
+    ap.add_argument("--cover-cache", action="store_true",
+                    help="Cache the compiled cover sheet and a precompiled LaTeX format of its preamble "
+                         "in ~/.cache/AGEx, and reuse them in later runs with the same TeX installation "
+                         "(identical cover inputs skip pdflatex entirely).")
+    ap.add_argument("--cover-single-pass", action="store_true",
+                    help="Always run pdflatex only once for the cover sheet. By default a second run is "
+                         "made only if the cover content uses \\label, \\ref, \\cite or similar.")
 
     # Output control
     ap.add_argument(
@@ -552,10 +982,19 @@ def main():
         "--keep-temp",
         action="store_true",
         help=(
-            "Do not delete the intermediate per-student PDFs that are created to build the combined PDFs. "
+            "With --per-student, do not delete the intermediate per-student PDFs that are merged into "
+            "answer_sheets_all.pdf. Without --per-student no intermediate PDFs are created. "
             "(Mostly useful for debugging.)"
         ),
     )
+    ap.add_argument(
+        "--fast-tmp",
+        action="store_true",
+        help=(
+            "Keep intermediate files (per-student PDFs, LaTeX build files) in RAM under /dev/shm "
+            "when available, instead of on disk."
+        ),
+    )
 
     args = ap.parse_args()
 
@@ -612,8 +1051,7 @@ def main():
         if not (0 <= int(ans) < int(per_q[i])):
             raise ValueError(f"Answer key entry for question {i+1} out of range: {ans} (options: {per_q[i]})")
 
-    with open(os.path.join(args.outdir, "layout.json"), "w", encoding="utf-8") as f:
-        json.dump(layout, f, indent=2)
+    dump_layout(os.path.join(args.outdir, "layout.json"), layout)
 
     # Build student definitions (names take precedence over IDs)
     student_names = []
@@ -649,11 +1087,8 @@ def main():
     if args.cover_tex is not None and not Path(args.cover_tex).exists():
         raise FileNotFoundError(f"--cover-tex not found: {args.cover_tex}")
 
-    # We build combined PDFs by first creating per-student PDFs and then merging.
-    tmp_dir_ctx = tempfile.TemporaryDirectory(prefix="sheets_", dir=str(Path(args.outdir).resolve()))
-    tmp_dir = Path(tmp_dir_ctx.name)
-
     answer_paths: List[str] = []
+    tmp_dir: Optional[Path] = None
 
     if student_names:
         student_iter = [
@@ -666,31 +1101,50 @@ def main():
             for sid_int in range(args.student_id_start, args.student_id_start + args.student_id_count)
         ]
 
-    for student_id, student_name, student_key in student_iter:
-        ans_pdf_tmp = tmp_dir / f"answer_sheet_{student_key}.pdf"
-        render_sheet(
-            str(ans_pdf_tmp),
+    render_kwargs = dict(
+        course_name=args.course_name,
+        professor=args.professor,
+        exam_date=args.exam_date,
+        prefix_header_only=args.prefix_header_only,
+        question_label=args.question_label,
+    )
+    # With --per-student, the combined PDF is merged from per-student PDFs
+    # rendered into a temp dir; otherwise all sheets go straight into one PDF.
+    if args.per_student and student_iter:
+        tmp_parent = (_fast_tmp_dir() if args.fast_tmp else None) or str(Path(args.outdir).resolve())
+        tmp_dir = Path(tempfile.mkdtemp(prefix="sheets_", dir=tmp_parent))
+
+        # Each sheet is independent, so render them in parallel worker processes.
+        # The layout is sent to each worker once, via the pool initializer.
+        workers = min(os.cpu_count() or 1, len(student_iter))
+        init_args = (layout, render_kwargs, str(tmp_dir), args.outdir)
+        if workers == 1:
+            _init_render_worker(*init_args)
+            answer_paths = [_render_one(student) for student in student_iter]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker,
+                                     initargs=init_args) as executor:
+                answer_paths = list(executor.map(
+                    _render_one,
+                    student_iter,
+                    chunksize=max(1, len(student_iter) // (4 * workers)),
+                ))
+    elif student_iter:
+        render_all_sheets(
+            os.path.join(args.outdir, "answer_sheets_all.pdf"),
             layout,
-            student_id=student_id,
-            student_name=student_name,
-            fill_solution=False,
-            course_name=args.course_name,
-            professor=args.professor,
-            exam_date=args.exam_date,
-            prefix_header_only=args.prefix_header_only,
-            question_label=args.question_label,
+            [(student_id, student_name) for student_id, student_name, _ in student_iter],
+            **render_kwargs,
         )
-        answer_paths.append(str(ans_pdf_tmp))
-
-        if args.per_student:
-            shutil.copyfile(ans_pdf_tmp, os.path.join(args.outdir, f"answer_sheet_{student_key}.pdf"))
 
     # Combined PDFs
     if answer_paths:
         merge_pdfs(os.path.join(args.outdir, "answer_sheets_all.pdf"), answer_paths)
 
     if do_cover:
-        cover_pdf_tmp = tmp_dir / "cover_sheet.pdf"
+        # The cover does not depend on the student, so a single pdflatex build
+        # is written straight to the combined output (no merge pass needed).
+        cover_pdf_all = os.path.join(args.outdir, "cover_sheets_all.pdf")
         # Append the answer-sheet prefix to the cover title if one was provided
         effective_cover_title = args.cover_title
         prefix = layout.get("question_prefix", "")
@@ -698,25 +1152,26 @@ def main():
             effective_cover_title = f"{args.cover_title} – {prefix}"
 
         compile_cover_pdf(
-            out_pdf=str(cover_pdf_tmp),
+            out_pdf=cover_pdf_all,
             cover_content_path=args.cover_tex,
             course_name=args.course_name,
             professor=args.professor,
             exam_date=args.exam_date,
             cover_title=effective_cover_title,
             no_cover_fields=args.no_cover_fields,
+            single_pass=args.cover_single_pass,
+            fast_tmp=args.fast_tmp,
+            use_cache=args.cover_cache,
         )
         if args.per_student:
-            shutil.copyfile(str(cover_pdf_tmp), os.path.join(args.outdir, "cover_sheet.pdf"))
-        merge_pdfs(os.path.join(args.outdir, "cover_sheets_all.pdf"), [str(cover_pdf_tmp)])
+            _publish(cover_pdf_all, os.path.join(args.outdir, "cover_sheet.pdf"))
 
     # Cleanup intermediate files unless requested
-    if args.keep_temp:
-        print(f"Keeping intermediate PDFs in: {tmp_dir}")
-        # Prevent automatic cleanup
-        tmp_dir_ctx.cleanup = lambda *a, **k: None  # type: ignore
-    else:
-        tmp_dir_ctx.cleanup()
+    if tmp_dir is not None:
+        if args.keep_temp:
+            print(f"Keeping intermediate PDFs in: {tmp_dir}")
+        else:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
 
     print("Done.")
 